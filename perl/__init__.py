@@ -1,6 +1,6 @@
 import builtins
+import sys
 
-from .console import replace_console
 from .loader import install_loader
 
 # Run automatic import of module loader, unless disabled
@@ -8,5 +8,18 @@ if not builtins.__dict__.get("__perl__disable_automatic_import", False):
     install_loader()
 
 # If running in an interactive console, replace it with ours
-if not builtins.__dict__.get("__perl__disable_automatic_console", False):
+if not builtins.__dict__.get("__perl__disable_automatic_console", False) and hasattr(
+    sys, "ps1"
+):
+    from .console import replace_console
+
     replace_console()
+
+
+def __getattr__(name):
+    # Import the compiler on first use
+    if name == "compile":
+        from .compiler import compile
+
+        return compile
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
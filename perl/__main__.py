@@ -8,22 +8,38 @@ Handle being called from the shell as::
 or from a shebang as::
 
     #!/path/to/python3.7 -mperl
+
+To report the time spent translating each imported module::
+
+    $ python -m perl --profile-imports script.py
 """
 import argparse
+import sys
 
-from .console import PerlConsole
-from .loader import load
+from .loader import format_stats, load, translation_index
 
 # Find and load the Python script
 parser = argparse.ArgumentParser(prog="python -m perl")
 parser.add_argument(
     dest="filename", metavar="filename.py", nargs="?", help="The file to run"
 )
+parser.add_argument(
+    "--profile-imports",
+    action="store_true",
+    help="Report translation telemetry for each module, most expensive first",
+)
 args = parser.parse_args()
 
 if args.filename:
-    load("__main__", args.filename)
+    translation_index.profile = args.profile_imports
+    try:
+        load("__main__", args.filename)
+    finally:
+        if args.profile_imports:
+            print(format_stats(translation_index.get_stats()), file=sys.stderr)
 
 else:
+    from .console import PerlConsole
+
     console = PerlConsole()
     console.interact()
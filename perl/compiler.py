@@ -0,0 +1,175 @@
+"""
+Compile Perl-flavoured source at runtime
+
+Translated code objects are cached by a hash of their source, so code which is
+generated and run repeatedly only needs to be translated and compiled once
+"""
+import builtins
+import hashlib
+import marshal
+import os
+import pkgutil
+from importlib.util import MAGIC_NUMBER
+
+from .loader import install_runtime
+from .translator import translate_string
+from .utils import LRUCache
+
+# Default number of code objects to keep in memory
+CODE_CACHE_SIZE = 128
+
+# Default number of code objects to keep on disk
+DISK_CACHE_SIZE = 1024
+
+# Hash of the translator source, so cached code is invalidated when it changes
+_translator_digest = None
+
+
+def get_translator_digest():
+    global _translator_digest
+    if _translator_digest is None:
+        # Read through the package loader so this works when installed as a zip
+        source = pkgutil.get_data("perl", "translator.py") or b""
+        _translator_digest = hashlib.sha256(source).hexdigest()
+    return _translator_digest
+
+
+class CodeCache(LRUCache):
+    """
+    Bounded LRU cache of translated code objects, keyed on a hash of the source
+
+    If ``directory`` is set, code objects are also marshalled to disk there, so they
+    can be shared between processes. Once there are more than ``disk_maxsize`` on disk,
+    the oldest are removed
+    """
+
+    def __init__(
+        self, maxsize=CODE_CACHE_SIZE, directory=None, disk_maxsize=DISK_CACHE_SIZE
+    ):
+        super().__init__(maxsize)
+        self.directory = directory
+        self.disk_maxsize = disk_maxsize
+
+    def _key(self, source, filename, mode):
+        digest = hashlib.sha256()
+        for part in (get_translator_digest(), mode, filename, source):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pyc")
+
+    def _load(self, key):
+        """
+        Load a code object from the disk cache, or return None if it isn't there
+        """
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if not data.startswith(MAGIC_NUMBER):
+            # Written by a different version of Python
+            return None
+        try:
+            return marshal.loads(data[len(MAGIC_NUMBER) :])
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def _save(self, key, code):
+        """
+        Write a code object to the disk cache
+        """
+        if not self.directory:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(MAGIC_NUMBER + marshal.dumps(code))
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk cache is an optimisation - failing to write it isn't an error
+            _remove(tmp_path)
+            return
+        self._prune()
+
+    def _prune(self):
+        """
+        Remove the oldest code objects from the disk cache until it is within
+        ``disk_maxsize``
+        """
+        try:
+            entries = [
+                entry
+                for entry in os.scandir(self.directory)
+                if entry.name.endswith(".pyc")
+            ]
+        except OSError:
+            return
+        excess = len(entries) - self.disk_maxsize
+        if excess <= 0:
+            return
+        entries.sort(key=_mtime)
+        for entry in entries[:excess]:
+            _remove(entry.path)
+
+    def compile(self, source, filename="<string>", mode="exec"):
+        """
+        Translate and compile the source, or return the cached code object
+        """
+        if isinstance(source, bytes):
+            source = source.decode("utf-8")
+
+        # The code will need its helpers when it is run
+        install_runtime()
+
+        key = self._key(source, filename, mode)
+        code = self.lookup(key)
+        if code is not None:
+            return code
+
+        code = self._load(key)
+        if code is None:
+            self.misses += 1
+            code = builtins.compile(
+                translate_string(source), filename, mode, dont_inherit=True
+            )
+            self._save(key, code)
+        else:
+            self.hits += 1
+
+        self.store(key, code)
+        return code
+
+
+def _mtime(entry):
+    try:
+        return entry.stat().st_mtime_ns
+    except OSError:
+        # Removed by another process
+        return 0
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+code_cache = CodeCache()
+
+
+def compile(source, filename="<string>", mode="exec"):
+    """
+    Translate and compile Perl-flavoured source into a code object, like the builtin
+    ``compile``
+
+    Results are cached in ``code_cache``
+    """
+    return code_cache.compile(source, filename, mode)
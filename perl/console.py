@@ -2,6 +2,7 @@ import sys
 from code import InteractiveConsole
 from tokenize import TokenError
 
+from .loader import install_runtime
 from .translator import translate_string
 
 
@@ -9,6 +10,7 @@ class PerlConsole(InteractiveConsole):
     def __init__(self, locals=None, filename="<console>", replacing=False):
         super().__init__(locals=locals, filename=filename)
         self.replacing = True
+        install_runtime()
 
     def interact(self, *args, **kwargs):
         super().interact(*args, **kwargs)
@@ -1,27 +1,179 @@
+"""
+Import hook
+
+Everything which isn't needed to install the hook is imported when it is first used,
+to keep ``import perl`` cheap for short-lived processes
+"""
 import builtins
-import re
+import io
+import os
 import sys
-from importlib import invalidate_caches
-from importlib.abc import SourceLoader
-from importlib.machinery import FileFinder
-from importlib.util import module_from_spec, spec_from_loader
+import time
+from importlib.machinery import FileFinder, SourceFileLoader
+
+# Directories of the standard library and this package, which never need translating
+STDLIB_PATH = os.path.dirname(os.__file__)
+PACKAGE_PATH = os.path.dirname(os.path.abspath(__file__))
+
+
+class IndexEntry:
+    __slots__ = ("mtime", "size", "digest", "translated")
 
-from .translator import translate
-from .utils import re_match, reset_vars
+    def __init__(self, mtime, size, digest, translated):
+        self.mtime = mtime
+        self.size = size
+        self.digest = digest
+        self.translated = translated
+
+
+class TranslationStats:
+    """
+    Telemetry for the translation of a module
+    """
 
+    __slots__ = ("name", "path", "tokens", "sites", "bytes_in", "bytes_out", "time")
 
-class PerlLoader(SourceLoader):
-    def __init__(self, name, path):
+    def __init__(self, name, path, tokens, sites, bytes_in, bytes_out, time):
         self.name = name
         self.path = path
+        self.tokens = tokens
+        self.sites = sites
+        self.bytes_in = bytes_in
+        self.bytes_out = bytes_out
+        self.time = time
+
+    def __repr__(self):
+        return f"<TranslationStats {self.name or self.path}: {self.time:.6f}s>"
+
+
+class TranslationIndex:
+    """
+    Index of translated source files, keyed on path
+
+    A file is only read again if its mtime or size have changed, and only translated
+    again if its content has changed
+
+    If ``profile`` is set, telemetry for each translation is collected in ``stats``
+    """
+
+    def __init__(self, profile=False):
+        self.entries = {}
+        self.profile = profile
+        self.stats = []
+        self.warmed_up = False
+
+    def get(self, path, name=None):
+        """
+        Return the translated source for the path
+        """
+        stat = os.stat(path)
+        entry = self.entries.get(path)
+        if (
+            entry is not None
+            and entry.mtime == stat.st_mtime_ns
+            and entry.size == stat.st_size
+        ):
+            return entry.translated
+
+        with open(path, "rb") as f:
+            data = f.read()
+
+        # The index only lives as long as the process, so the builtin hash is enough
+        # to tell if the content has changed, and saves importing hashlib
+        digest = hash(data)
+
+        if entry is not None and entry.digest == digest:
+            # Touched but not changed
+            translated = entry.translated
+        else:
+            from .translator import PerlTranslator, translate, translate_string
+
+            if self.profile and not self.warmed_up:
+                # Tokenizer and translator setup happens on first use, so get that
+                # out of the way rather than charge it to the first module timed
+                translate_string('x = "x" =~ s/x/$1/g\n')
+                self.warmed_up = True
+
+            start = time.perf_counter()
+            translator = PerlTranslator()
+            source = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8").read()
+            translated = translate(io.StringIO(source).readline, translator)
+            if self.profile:
+                self.stats.append(
+                    TranslationStats(
+                        name,
+                        path,
+                        translator.tokens,
+                        translator.sites,
+                        len(data),
+                        len(translated.encode("utf-8")),
+                        time.perf_counter() - start,
+                    )
+                )
+            if translated != source:
+                # Translated code will need its helpers
+                install_runtime()
+
+        self.entries[path] = IndexEntry(
+            stat.st_mtime_ns, stat.st_size, digest, translated
+        )
+        return translated
+
+    def is_stale(self, path):
+        """
+        Check if the file has changed since it was last translated
+        """
+        entry = self.entries.get(path)
+        if entry is None:
+            return True
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return True
+        return entry.mtime != stat.st_mtime_ns or entry.size != stat.st_size
+
+    def stale(self):
+        """
+        Return a list of indexed paths which have changed since they were translated
+        """
+        return [path for path in list(self.entries) if self.is_stale(path)]
+
+    def stale_modules(self):
+        """
+        Return a list of the names of loaded modules whose files have changed since
+        they were translated
+        """
+        return [
+            name
+            for name, module in list(sys.modules.items())
+            if getattr(module, "__file__", None) in self.entries
+            and self.is_stale(module.__file__)
+        ]
+
+    def get_stats(self):
+        """
+        Return the collected telemetry, most expensive first
+        """
+        return sorted(self.stats, key=lambda stats: stats.time, reverse=True)
+
+    def discard(self, path):
+        self.entries.pop(path, None)
+
+    def clear(self):
+        self.entries.clear()
+
 
-    def get_filename(self, name):
-        return self.path
+translation_index = TranslationIndex()
+
+
+class PerlLoader(SourceFileLoader):
+    def path_stats(self, path):
+        # Bytecode compiled from the original source would skip translation, so
+        # never read or write it
+        raise OSError("perl does not cache bytecode")
 
     def get_data(self, filename):
-        with open(filename, "r", encoding="utf-8") as f:
-            data = translate(f.readline)
-        return data
+        return translation_index.get(filename, self.name)
 
 
 def install_loader():
@@ -35,21 +187,107 @@ def install_loader():
         builtins.__dict__["__perl__disable_automatic_import"] = True
     """
     # Set up import hook
-    loader_details = PerlLoader, [".py"]
-    sys.path_hooks.insert(0, FileFinder.path_hook(loader_details))
-    sys.path_importer_cache.clear()
-    invalidate_caches()
+    sys.path_hooks.insert(0, path_hook)
+
+    # Drop cached finders so the paths they cover are found again with our hook,
+    # leaving the standard library and anything which isn't a FileFinder alone
+    for path, finder in list(sys.path_importer_cache.items()):
+        if isinstance(finder, FileFinder) and not is_stdlib(path):
+            del sys.path_importer_cache[path]
+
+
+def is_stdlib(path):
+    """
+    Check if the path is in the standard library, excluding any site-packages
+    """
+    path = os.path.abspath(path)
+    if path != STDLIB_PATH and not path.startswith(STDLIB_PATH + os.sep):
+        return False
+    parts = path[len(STDLIB_PATH) :].split(os.sep)
+    return "site-packages" not in parts and "dist-packages" not in parts
+
 
-    # Inject dependencies for rewritten code
-    builtins.__dict__["re"] = re
-    builtins.__dict__["__perl__re_match"] = re_match
-    builtins.__dict__["__perl__reset_vars"] = reset_vars
+_file_finder_hook = FileFinder.path_hook((PerlLoader, [".py"]))
+
+
+def path_hook(path):
+    """
+    Path hook to find modules for PerlLoader, outside the standard library and this
+    package - which is imported lazily, so must not need translating itself
+    """
+    if is_stdlib(path) or os.path.abspath(path) == PACKAGE_PATH:
+        raise ImportError("perl does not translate this path", path=path)
+    return _file_finder_hook(path)
+
+
+def get_runtime():
+    """
+    Return the dependencies for translated code, keyed on the names it uses
+    """
+    import re
+
+    from .utils import (
+        re_compile,
+        re_groups,
+        re_match,
+        re_once,
+        re_str,
+        reset_vars,
+        split,
+        split_targets,
+    )
+
+    return {
+        "re": re,
+        "__perl__re_match": re_match,
+        "__perl__reset_vars": reset_vars,
+        "__perl__re_groups": re_groups,
+        "__perl__re_compile": re_compile,
+        "__perl__re_once": re_once,
+        "__perl__split": split,
+        "__perl__split_targets": split_targets,
+        "__perl__str": re_str,
+    }
+
+
+def install_runtime():
+    """
+    Inject dependencies for translated code into builtins
+
+    This is called when translated code is first loaded or compiled
+    """
+    if builtins.__dict__.get("__perl__runtime_installed", False):
+        return
+
+    # Inject everything in one update, and only mark it done once it's complete
+    builtins.__dict__.update(get_runtime())
+    builtins.__dict__["__perl__runtime_installed"] = True
+
+
+def format_stats(stats):
+    """
+    Format a list of TranslationStats as a report table
+    """
+    lines = [
+        f"{'time (ms)':>10} {'tokens':>8} {'sites':>6} {'bytes in':>9} "
+        f"{'bytes out':>9}  module"
+    ]
+    for module in stats:
+        lines.append(
+            f"{module.time * 1000:>10.3f} {module.tokens:>8} {module.sites:>6} "
+            f"{module.bytes_in:>9} {module.bytes_out:>9}  {module.name or module.path}"
+        )
+    total = sum(module.time for module in stats)
+    lines.append(f"{total * 1000:>10.3f} total for {len(stats)} modules")
+    return "\n".join(lines)
 
 
 def load(module_name, filename):
     """
     Helper function to load the specified filename into the specified module name
     """
+    from importlib.util import module_from_spec, spec_from_loader
+
     loader = PerlLoader(module_name, filename)
     spec = spec_from_loader(loader.name, loader)
     module = module_from_spec(spec)
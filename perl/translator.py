@@ -3,8 +3,14 @@ import re
 import tokenize
 from enum import Enum
 
-# List of standard Python modifiers, plus the g modifier from Perl
-MODIFIERS = set("AILMSXG")
+# List of standard Python modifiers, plus the g and o modifiers from Perl
+MODIFIERS = set("AILMSXGO")
+
+# Modifiers only valid on a substitution - e from Perl, and c to count replacements
+REPLACE_MODIFIERS = set("EC")
+
+# Tokens which can come before the first name in a statement
+STATEMENT_START = (tokenize.NEWLINE, tokenize.NL, tokenize.INDENT, tokenize.DEDENT)
 
 
 class ParseError(Exception):
@@ -17,9 +23,17 @@ class CollectState(Enum):
     COMPLETE = 2
 
 
+class TargetState(Enum):
+    NAME = 0
+    SEPARATOR = 1
+    EQUALS = 2
+    COMPLETE = 3
+
+
 class Op(Enum):
     MATCH = 1
     REPLACE = 2
+    SPLIT = 3
 
 
 class Modifier(Enum):
@@ -30,10 +44,22 @@ class Modifier(Enum):
     DOTALL = "S"
     VERBOSE = "X"
     GLOBAL = "G"
+    ONCE = "O"
+    EVAL = "E"
+    COUNT = "C"
+
+
+class Variable(str):
+    """
+    Name of a variable interpolated into a pattern
+    """
 
 
 class PerlTranslator:
     def __init__(self, *args, **kwargs):
+        # Counters for the last translation
+        self.tokens = 0
+        self.sites = 0
         self.clear()
         return super().__init__(*args, **kwargs)
 
@@ -46,17 +72,28 @@ class PerlTranslator:
     def clear(self):
         self.buffer = []
         self.dollar = False
+        self.targets = []
+        self.targets_whitespace = None
+        self.collecting_targets = None
+        self.assign = None
+        self.assign_equals = None
         self.variable = None
+        self.is_attribute = False
+        self.is_bare = False
         self.equals = False
         self.tilde = False
         self.op = None
         self.collecting_match = CollectState.WAITING
         self.match = []
+        self.match_dollar = None
         self.collecting_replace = CollectState.WAITING
         self.replace = []
         self.collecting_modifiers = CollectState.WAITING
         self.flags = []
         self.is_global = False
+        self.is_once = False
+        self.is_eval = False
+        self.is_count = False
 
     def untokenize(self, tok):
         """
@@ -106,9 +143,15 @@ class PerlTranslator:
     def translate(self, readline):
         self.last_line = 1
         self.last_col = 0
+        self.tokens = 0
+        self.sites = 0
         self.clear()
 
+        previous = last = None
         for tok in tokenize.generate_tokens(readline):
+            self.tokens += 1
+            previous, last = last, tok
+
             # Get token value with whitespace
             tok.original = self.untokenize(tok)
             self.buffer.append(tok.original)
@@ -152,10 +195,45 @@ class PerlTranslator:
             # Convert regex
             #
 
+            if self.collecting_targets not in (None, TargetState.COMPLETE):
+                # Collecting a list of assignment targets, eg ``(a, b) = var =~``
+                if self.collect_target(tok):
+                    continue
+
+                if self.collecting_targets != TargetState.SEPARATOR:
+                    yield from self.reset()
+                    continue
+
+                # False start, eg ``if (var =~`` - last name is the variable
+                self.buffer.pop()
+                variable = self.buffer.pop()
+                yield from self.reset()
+                self.variable = variable
+                self.buffer.extend([variable, tok.original])
+                if tok.type == tokenize.OP and tok.string == "=":
+                    self.equals = True
+                else:
+                    yield from self.reset()
+                continue
+
             if not self.variable:
                 if tok.type == tokenize.NAME:
                     # Store with any leading whitespace - we'll need that when rendering
                     self.variable = tok.original
+                    self.is_attribute = previous is not None and previous.string == "."
+                    # A bare name starts its statement, so can be the only target
+                    self.is_bare = previous is None or (
+                        previous.type in STATEMENT_START
+                        or previous.type == tokenize.OP
+                        and previous.string in (";", ":")
+                    )
+                elif (
+                    tok.type == tokenize.OP
+                    and tok.string == "("
+                    and self.collecting_targets is None
+                ):
+                    self.collecting_targets = TargetState.NAME
+                    self.targets_whitespace = tok.original[: -len(tok.string)]
                 else:
                     yield from self.reset()
                 continue
@@ -163,6 +241,16 @@ class PerlTranslator:
             if not self.equals:
                 if tok.type == tokenize.OP and tok.string == "=":
                     self.equals = True
+                elif (
+                    tok.type == tokenize.OP
+                    and tok.string == "("
+                    and self.variable.lstrip() == "split"
+                    and not self.is_attribute
+                ):
+                    # Split, eg ``split(/pattern/, string)`` - expect the pattern next
+                    self.equals = True
+                    self.tilde = True
+                    self.op = Op.SPLIT
                 elif tok.type == tokenize.NAME:
                     # We may have had a false start, eg ``if x =~``
                     self.buffer.pop()
@@ -178,10 +266,19 @@ class PerlTranslator:
                 if tok.type == tokenize.OP and tok.string == "~":
                     self.tilde = True
                 elif tok.type == tokenize.NAME:
-                    # We may have had a false start, eg ``m = x =~`
+                    # We may have had a false start, eg ``m = x =~``, so hold on to
+                    # the assignment in case it needs to be rendered with the regex
                     self.buffer.pop()
-                    yield from self.reset()
+                    if self.assign or self.targets or not self.is_bare:
+                        # Chained assignment, or a target which isn't a single name,
+                        # eg ``obj.n =`` - leave the targets as they are
+                        yield from self.reset()
+                    else:
+                        self.assign, self.assign_equals = self.buffer
                     self.variable = tok.original
+                    self.is_attribute = False
+                    self.is_bare = False
+                    self.equals = False
                     self.buffer.append(tok.original)
                 else:
                     yield from self.reset()
@@ -196,11 +293,14 @@ class PerlTranslator:
                 if tok.type == tokenize.NAME and tok.string in ["m", "s"]:
                     if tok.string == "m":
                         self.op = Op.MATCH
-                    else:
+                    elif not self.targets:
                         self.op = Op.REPLACE
-                elif tok.type == tokenize.OP and tok.string == "/":
+                    else:
+                        # Replace can't be assigned to a list
+                        yield from self.reset()
+                elif tok.type == tokenize.OP and tok.string in ("/", "/="):
                     self.op = Op.MATCH
-                    self.collecting_match = CollectState.ACTIVE
+                    self.open_match(tok)
                 else:
                     # Not a valid op
                     yield from self.reset()
@@ -208,21 +308,40 @@ class PerlTranslator:
 
             # If we're not collecting the match yet, expect a /
             if self.collecting_match == CollectState.WAITING:
-                if tok.type == tokenize.OP and tok.string == "/":
-                    self.collecting_match = CollectState.ACTIVE
+                if tok.type == tokenize.OP and tok.string in ("/", "/="):
+                    self.open_match(tok)
                 else:
                     yield from self.reset()
                 continue
 
             if self.collecting_match == CollectState.ACTIVE:
+                # Check for interpolated variable, eg ``/^$prefix/``
+                if self.match_dollar:
+                    dollar = self.match_dollar
+                    self.match_dollar = None
+                    if tok.type == tokenize.NAME and not tok.original[0].isspace():
+                        self.match.append(dollar[:-1])
+                        self.match.append(Variable(tok.string))
+                        continue
+                    # Not a variable, just an anchor - fall through to this token
+                    self.match.append(dollar)
+
+                if (
+                    tok.type == tokenize.ERRORTOKEN
+                    and tok.string == "$"
+                    and not is_escaped(self.match)
+                ):
+                    # Hold on to it with its whitespace
+                    self.match_dollar = tok.original
+                    continue
+
                 # Check for close
                 if tok.type == tokenize.OP and tok.string == "/":
-                    if len(self.match) > 0 and self.match[-1] == "\\":
-                        # It was escaped
-                        self.match.pop()
-                        self.match.append(tok.string)
+                    if is_escaped(self.match):
+                        self.match[-1] = self.match[-1][:-1] + tok.original
                     else:
-                        # Match closed
+                        # Match closed, keeping any whitespace before it
+                        self.match.append(leading_whitespace(tok))
                         self.collecting_match = CollectState.COMPLETE
 
                         if self.op == Op.REPLACE:
@@ -230,29 +349,32 @@ class PerlTranslator:
                         else:
                             self.collecting_modifiers = CollectState.ACTIVE
                 else:
-                    self.match.append(tok.string)
+                    # Keep whitespace - it's significant in a pattern
+                    self.match.append(tok.original)
                 continue
 
             if self.collecting_replace == CollectState.ACTIVE:
                 # Check for close
                 if tok.type == tokenize.OP and tok.string == "/":
-                    if len(self.replace) > 0 and self.replace[-1] == "\\":
-                        # It was escaped
-                        self.replace.pop()
-                        self.replace.append(tok.string)
+                    if is_escaped(self.replace):
+                        self.replace[-1] = self.replace[-1][:-1] + tok.original
                     else:
                         # Replace close
+                        self.replace.append(leading_whitespace(tok))
                         self.collecting_replace = CollectState.COMPLETE
                         self.collecting_modifiers = CollectState.ACTIVE
                 else:
-                    self.replace.append(tok.string)
+                    self.replace.append(tok.original)
                 continue
 
             if self.collecting_modifiers == CollectState.ACTIVE:
-                if tok.type == tokenize.NAME:
+                if tok.type == tokenize.NAME and not tok.original[0].isspace():
                     # May have found a modifier
                     modifiers = set(tok.string.upper())
-                    if modifiers.difference(MODIFIERS):
+                    valid = MODIFIERS
+                    if self.op == Op.REPLACE:
+                        valid = MODIFIERS | REPLACE_MODIFIERS
+                    if modifiers.difference(valid):
                         # Invalid modifier
                         yield from self.reset()
                         continue
@@ -261,6 +383,20 @@ class PerlTranslator:
                     if Modifier.GLOBAL.value in modifiers:
                         self.is_global = True
                         modifiers.remove(Modifier.GLOBAL.value)
+                    if Modifier.ONCE.value in modifiers:
+                        self.is_once = True
+                        modifiers.remove(Modifier.ONCE.value)
+                    if Modifier.EVAL.value in modifiers:
+                        self.is_eval = True
+                        modifiers.remove(Modifier.EVAL.value)
+                    if Modifier.COUNT.value in modifiers:
+                        if not self.assign:
+                            raise ParseError(
+                                "The c modifier needs"
+                                " the result assigned to a single name"
+                            )
+                        self.is_count = True
+                        modifiers.remove(Modifier.COUNT.value)
                     self.flags = [Modifier(modifier) for modifier in modifiers]
                     self.collecting_modifiers = CollectState.COMPLETE
 
@@ -301,36 +437,138 @@ class PerlTranslator:
             # In case we started collecting one, clear any buffer
             yield from self.reset()
 
+    def open_match(self, tok):
+        """
+        Start collecting the pattern
+
+        A pattern starting with ``=`` is tokenized as the ``/=`` operator
+        """
+        self.collecting_match = CollectState.ACTIVE
+        if tok.string == "/=":
+            self.match.append("=")
+
+    def collect_target(self, tok):
+        """
+        Collect the next token of a list of assignment targets
+
+        Returns True if the token was valid at this point
+        """
+        if tok.type == tokenize.NAME:
+            if self.collecting_targets == TargetState.NAME:
+                self.targets.append(tok.string)
+                self.collecting_targets = TargetState.SEPARATOR
+                return True
+
+        elif tok.type == tokenize.OP:
+            if self.collecting_targets == TargetState.SEPARATOR:
+                if tok.string == ",":
+                    self.collecting_targets = TargetState.NAME
+                    return True
+                if tok.string == ")":
+                    self.collecting_targets = TargetState.EQUALS
+                    return True
+
+            elif self.collecting_targets == TargetState.NAME:
+                # Allow a trailing comma, eg ``(a, b,)``
+                if tok.string == ")" and self.targets:
+                    self.collecting_targets = TargetState.EQUALS
+                    return True
+
+            elif self.collecting_targets == TargetState.EQUALS:
+                if tok.string == "=":
+                    self.collecting_targets = TargetState.COMPLETE
+                    return True
+
+        return False
+
+    def render_targets(self):
+        """
+        Render the list of assignment targets
+        """
+        targets = ", ".join(self.targets)
+        if len(self.targets) == 1:
+            targets += ","
+        return f"{self.targets_whitespace}({targets})"
+
     def render(self):
         """
         Render the regular expression
         """
+        self.sites += 1
+
         # Collect leading whitespace
         variable = self.variable.lstrip()
         whitespace = self.variable[: -len(variable)]
-        match = "".join(self.match)
 
         # Build flags string
-        if self.flags:
-            flags_ops = " | ".join([f"re.{flag.value}" for flag in self.flags])
+        flags_ops = " | ".join([f"re.{flag.value}" for flag in self.flags])
+        if flags_ops:
             flags = f", flags={flags_ops}"
         else:
             flags = ""
 
+        # Interpolated patterns are always compiled at runtime through our cache
+        interpolated = any(isinstance(part, Variable) for part in self.match)
+        if interpolated:
+            match = "".join(
+                f"{{{part}}}"
+                if isinstance(part, Variable)
+                else part.replace("{", "{{").replace("}", "}}")
+                for part in self.match
+            )
+            pattern = f"rf'{match}'"
+        else:
+            match = "".join(self.match)
+            pattern = f"r'{match}'"
+        compiler = "__perl__re_once" if self.is_once else "__perl__re_compile"
+        compiled = f"{compiler}({pattern}{', ' if flags_ops else ''}{flags_ops})"
+
         # Build ops
+        if self.op == Op.SPLIT:
+            # Render the start of the call, the string and limit arguments follow
+            if self.targets:
+                # Pad the fields to fill the targets
+                return (
+                    f"{self.render_targets()} ="
+                    f"{whitespace}__perl__split_targets({len(self.targets)}, {compiled}"
+                )
+            python = [f"{whitespace}__perl__split(", compiled]
+            if self.assign:
+                python.insert(0, f"{self.assign}{self.assign_equals}")
+            return "".join(python)
+
         if self.op == Op.MATCH:
-            # Pass the match into our code so we can set vars
-            python = [
-                f"{whitespace}__perl__re_match(",
-                f"re.{'finditer' if self.is_global else 'search'}",
-                f"(r'{match}', {variable}{flags})",
-                ")",
-            ]
+            method = "finditer" if self.is_global else "search"
+            if interpolated:
+                call = f"{compiled}.{method}({variable})"
+            else:
+                call = f"re.{method}({pattern}, {variable}{flags})"
+
+            if self.targets:
+                # Unpack groups directly into the targets, without setting vars
+                python = [
+                    f"{self.render_targets()} = __perl__re_groups(",
+                    call,
+                    f", {len(self.targets)})",
+                ]
+            else:
+                # Pass the match into our code so we can set vars
+                python = [f"{whitespace}__perl__re_match(", call, ")"]
+                if self.assign:
+                    python.insert(0, f"{self.assign}{self.assign_equals}")
 
         else:
-            # Build replace  and covert any backrefs
-            replace = "".join(self.replace)
-            replace = re.sub(r"\$(\w+)", r"\\g\g<1>", replace)
+            if self.is_eval:
+                # Evaluate the replacement as an expression for each match, with
+                # dollar vars looked up on the match
+                expression = translate_string("".join(self.replace).strip())
+                expression = re.sub(r"__perl__var__(\w+)", render_group, expression)
+                replace = f"lambda __perl__m: __perl__str({expression})"
+            else:
+                # Build replace  and covert any backrefs
+                replace = "".join(self.replace)
+                replace = re.sub(r"\$(\w+)", r"\\g<\g<1>>", replace)
+                replace = f"r'{replace}'"
 
             if self.is_global:
                 # By default the count is unlimited
@@ -339,12 +577,26 @@ class PerlTranslator:
                 # Not global, specify one
                 count = ", count=1"
 
+            if self.is_count and self.assign:
+                # Assign the number of replacements, like Perl
+                method = "subn"
+                assign = self.assign.lstrip()
+                whitespace = self.assign[: -len(assign)]
+                targets = f"{variable}, {assign}"
+            else:
+                method = "sub"
+                targets = variable
+                if self.assign:
+                    # A plain assignment is left as it was written
+                    whitespace = f"{self.assign}{self.assign_equals}{whitespace}"
+
+            if interpolated:
+                call = f"{compiled}.{method}({replace}, {variable}{count})"
+            else:
+                call = f"re.{method}({pattern}, {replace}, {variable}{count}{flags})"
+
             # Regex needs to reset the vars first in case it's a None
-            python = [
-                f"{whitespace}{variable} = __perl__reset_vars() or ",
-                f"re.sub(r'{match}', r'{replace}', {variable}",
-                f"{count}{flags})",
-            ]
+            python = [f"{whitespace}{targets} = __perl__reset_vars() or ", call]
 
         return "".join(python)
 
@@ -372,8 +624,34 @@ class PerlTranslator:
         return "".join(translated)
 
 
-def translate(src_generator):
-    dest_generator = PerlTranslator().translate(src_generator)
+def leading_whitespace(tok):
+    """
+    Return the whitespace before the token
+    """
+    return tok.original[: len(tok.original) - len(tok.string)]
+
+
+def is_escaped(parts):
+    """
+    Check if the last of the collected parts ends with a backslash
+    """
+    return len(parts) > 0 and parts[-1].endswith("\\")
+
+
+def render_group(var):
+    """
+    Render a dollar var in an evaluated replacement as a lookup on the match
+    """
+    name = var.group(1)
+    if name.isdigit():
+        return f"__perl__m[{name}]"
+    return f"__perl__m[{name!r}]"
+
+
+def translate(src_generator, translator=None):
+    if translator is None:
+        translator = PerlTranslator()
+    dest_generator = translator.translate(src_generator)
     return "".join(dest_generator)
 
 
@@ -3,6 +3,97 @@ Utility functions for translated code
 """
 import builtins
 import re
+import sys
+import weakref
+from collections import OrderedDict, namedtuple
+from itertools import islice
+
+# Default number of dynamic patterns to keep compiled
+REGEX_CACHE_SIZE = 256
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache which counts its hits and misses
+    """
+
+    def __init__(self, maxsize):
+        self._maxsize = maxsize
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize):
+        self._maxsize = maxsize
+        self._trim()
+
+    def _trim(self):
+        while len(self.items) > self._maxsize:
+            self.items.popitem(last=False)
+
+    def lookup(self, key):
+        """
+        Return the cached value and count a hit, or return None if it isn't cached
+        """
+        try:
+            value = self.items[key]
+        except KeyError:
+            return None
+        self.hits += 1
+        self.items.move_to_end(key)
+        return value
+
+    def store(self, key, value):
+        if self._maxsize > 0:
+            self.items[key] = value
+            self._trim()
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self._maxsize, len(self.items))
+
+    def clear(self):
+        self.items.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class RegexCache(LRUCache):
+    """
+    Bounded LRU cache of compiled regular expressions
+
+    Used for interpolated patterns, which can't be emitted as literals and would
+    otherwise churn through the ``re`` module's own cache
+    """
+
+    def __init__(self, maxsize=REGEX_CACHE_SIZE):
+        super().__init__(maxsize)
+
+    def compile(self, pattern, flags=0):
+        """
+        Return the compiled pattern, compiling it if it isn't in the cache
+        """
+        key = (type(pattern), pattern, flags)
+        compiled = self.lookup(key)
+        if compiled is None:
+            self.misses += 1
+            compiled = re.compile(pattern, flags)
+            self.store(key, compiled)
+        return compiled
+
+
+regex_cache = RegexCache()
+
+# Patterns compiled by the ``o`` modifier, keyed on the calling code object and then
+# the call site's bytecode offset
+_once_patterns: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
 
 
 def reset_vars():
@@ -33,3 +124,113 @@ def re_match(match):
             builtins.__dict__[f"__perl__var__{key}"] = val
 
     return match
+
+
+def re_groups(match, count):
+    """
+    Return ``count`` groups from a possible Match, or from an iterator of matches when
+    the global flag is set, for unpacking into a list of assignment targets
+
+    Missing groups are None, like undefined values in Perl's list assignment. As in
+    Perl, a successful match without groups returns 1, and a global match without
+    groups returns each matched string
+    """
+    if isinstance(match, re.Match):
+        groups = match.groups() or (1,)
+        if len(groups) == count:
+            return groups
+    elif match is None:
+        return (None,) * count
+    else:
+        groups = tuple(
+            group for each in match for group in (each.groups() or (each.group(),))
+        )
+    return (groups + (None,) * count)[:count]
+
+
+def re_str(value):
+    """
+    Convert the result of an evaluated replacement to a string, treating None as
+    empty like an undefined value in Perl
+    """
+    if value is None:
+        return ""
+    return str(value)
+
+
+def re_compile(pattern, flags=0):
+    """
+    Compile an interpolated pattern through the shared regex cache
+    """
+    return regex_cache.compile(pattern, flags)
+
+
+def re_once(pattern, flags=0):
+    """
+    Compile an interpolated pattern the first time its call site is reached, and
+    return that compiled pattern every time after - Perl's ``o`` modifier
+    """
+    frame = sys._getframe(1)
+    sites = _once_patterns.setdefault(frame.f_code, {})
+    try:
+        return sites[frame.f_lasti]
+    except KeyError:
+        compiled = sites[frame.f_lasti] = re.compile(pattern, flags)
+        return compiled
+
+
+def split(pattern, string, limit=0):
+    """
+    Lazily split a string on a compiled pattern, following Perl's ``split``
+
+    Yields each field, followed by any groups captured by the separator. A positive
+    ``limit`` is the maximum number of fields; when it is 0, trailing empty fields are
+    removed. Works on anything ``re`` can search, such as an mmap
+    """
+    length = len(string)
+    if not length:
+        # Splitting an empty string always returns an empty list
+        return
+
+    # Empty fields are held back until we know they aren't trailing
+    pending = []
+    last_end = 0
+    fields = 1
+    for match in pattern.finditer(string):
+        start, end = match.span()
+        if start == end and (start == last_end or start == length):
+            # An empty match never produces an empty field at either end, or next to
+            # the previous separator
+            continue
+        if 0 < limit <= fields:
+            break
+
+        for field in (string[last_end:start],) + match.groups():
+            if limit == 0 and not field:
+                pending.append(field)
+                continue
+            if pending:
+                yield from pending
+                pending.clear()
+            yield field
+
+        last_end = end
+        fields += 1
+
+    field = string[last_end:]
+    if limit != 0 or field:
+        yield from pending
+        yield field
+
+
+def split_targets(count, pattern, string, limit=0):
+    """
+    Split a string for assignment to a list of ``count`` targets
+
+    As in Perl, a limit of 0 is treated as one more than the number of targets, and
+    missing fields are None
+    """
+    if limit == 0:
+        limit = count + 1
+    fields = tuple(islice(split(pattern, string, limit), count))
+    return fields + (None,) * (count - len(fields))
@@ -0,0 +1,11 @@
+import pytest
+
+from perl.loader import get_runtime
+
+
+@pytest.fixture
+def _globals():
+    """
+    Globals for running translated code, with the helpers the loader would inject
+    """
+    return get_runtime()
@@ -0,0 +1,77 @@
+import os
+import re
+
+from perl.compiler import CodeCache
+
+
+def test_compile__translated(_globals):
+    cache = CodeCache()
+    code = cache.compile("result = var =~ /foo/", "<rule>", "exec")
+    ldict = {"var": "one foo two"}
+    exec(code, _globals, ldict)
+    assert isinstance(ldict["result"], re.Match)
+
+
+def test_compile__repeated__cached():
+    cache = CodeCache()
+    code = cache.compile("var =~ s/foo/bar/")
+    assert cache.compile("var =~ s/foo/bar/") is code
+    assert cache.compile("var =~ s/foo/bar/", mode="single") is not code
+    assert cache.info() == (1, 2, 128, 2)
+
+
+def test_compile__bounded():
+    cache = CodeCache(maxsize=1)
+    cache.compile("a = 1")
+    cache.compile("b = 2")
+    cache.compile("a = 1")
+    assert cache.info() == (0, 3, 1, 1)
+
+
+def test_compile__disk_cache(tmp_path):
+    cache = CodeCache(directory=str(tmp_path))
+    code = cache.compile("var =~ /foo/", "<rule>")
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # A new cache with the same directory loads it instead of compiling
+    cache = CodeCache(directory=str(tmp_path))
+    assert cache.compile("var =~ /foo/", "<rule>") == code
+    assert cache.info().misses == 0
+
+
+def test_compile__translator_changed__not_loaded(tmp_path, monkeypatch):
+    cache = CodeCache(directory=str(tmp_path))
+    cache.compile("var =~ /foo/", "<rule>")
+
+    # Code compiled by another version of the translator is ignored
+    monkeypatch.setattr("perl.compiler._translator_digest", "changed")
+    cache = CodeCache(directory=str(tmp_path))
+    cache.compile("var =~ /foo/", "<rule>")
+    assert cache.info().misses == 1
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_compile__disk_cache__bounded(tmp_path):
+    cache = CodeCache(directory=str(tmp_path), disk_maxsize=2)
+    cache.compile("a = 1")
+    (oldest,) = tmp_path.iterdir()
+    os.utime(oldest, ns=(0, 0))
+    cache.compile("b = 2")
+    cache.compile("c = 3")
+
+    # The oldest file was removed
+    paths = list(tmp_path.iterdir())
+    assert len(paths) == 2
+    assert oldest not in paths
+
+
+def test_compile__disk_cache__write_failed(tmp_path, monkeypatch):
+    def replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", replace)
+    cache = CodeCache(directory=str(tmp_path))
+    cache.compile("var =~ /foo/")
+
+    # The temporary file was cleaned up
+    assert list(tmp_path.iterdir()) == []
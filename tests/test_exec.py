@@ -1,14 +1,6 @@
 import re
 
-import pytest
-
 from perl.translator import translate_string
-from perl.utils import re_match, reset_vars
-
-
-@pytest.fixture
-def _globals():
-    return {"re": re, "__perl__re_match": re_match, "__perl__reset_vars": reset_vars}
 
 
 def test_match__value_present__returns_true(_globals):
@@ -32,3 +24,113 @@ def test_match__value_match__value_set(_globals):
     assert isinstance(result, re.Match)
     assert "__perl__var__1" in _globals["__builtins__"]
     assert _globals["__builtins__"]["__perl__var__1"] == "foo"
+
+
+def test_match__interpolated__value_match(_globals):
+    ldict = {"var": "id42", "prefix": "id"}
+    src = translate_string(r"var =~ /^$prefix(\d+)$/")
+    result = eval(src, _globals, ldict)
+    assert isinstance(result, re.Match)
+    assert _globals["__builtins__"]["__perl__var__1"] == "42"
+
+
+def test_match__interpolated_once__compiled_once(_globals):
+    code = compile(
+        translate_string("results.append(var =~ /^$prefix/o)"), "<test>", "exec"
+    )
+    ldict = {"results": [], "var": "foo"}
+    for prefix in ["foo", "bar"]:
+        ldict["prefix"] = prefix
+        exec(code, _globals, ldict)
+    assert all(isinstance(result, re.Match) for result in ldict["results"])
+
+
+def test_replace__interpolated__value_replaced(_globals):
+    ldict = {"var": "one foo two", "word": "foo"}
+    src = translate_string("var =~ s/$word/bar/")
+    exec(src, _globals, ldict)
+    assert ldict["var"] == "one bar two"
+
+
+def test_match__list_assign__values_set(_globals):
+    ldict = {"var": "12-34"}
+    exec(translate_string(r"(a, b) = var =~ /(\d+)-(\d+)/"), _globals, ldict)
+    assert ldict["a"] == "12"
+    assert ldict["b"] == "34"
+
+
+def test_match__list_assign_no_match__values_none(_globals):
+    ldict = {"var": "one two"}
+    exec(translate_string(r"(a, b) = var =~ /(\d+)-(\d+)/"), _globals, ldict)
+    assert ldict["a"] is None
+    assert ldict["b"] is None
+
+
+def test_match__list_assign_without_groups__success_set(_globals):
+    ldict = {"var": "one foo two"}
+    exec(translate_string("(a,) = var =~ /foo/"), _globals, ldict)
+    assert ldict["a"] == 1
+
+    ldict = {"var": "one two"}
+    exec(translate_string("(a,) = var =~ /foo/"), _globals, ldict)
+    assert ldict["a"] is None
+
+
+def test_match__list_assign_global__values_set(_globals):
+    ldict = {"var": "1 2 3"}
+    exec(translate_string(r"(a, b) = var =~ /(\d)/g"), _globals, ldict)
+    assert (ldict["a"], ldict["b"]) == ("1", "2")
+
+
+def test_replace__eval__value_replaced(_globals):
+    ldict = {"var": "a1 b2 c3"}
+    exec(translate_string(r"var =~ s/(\d)/int($1) * 2/ge"), _globals, ldict)
+    assert ldict["var"] == "a2 b4 c6"
+
+
+def test_replace__eval_optional_group__empty(_globals):
+    ldict = {"var": "xy y"}
+    exec(translate_string("var =~ s/(x)?y/$1/ge"), _globals, ldict)
+    assert ldict["var"] == "x "
+
+
+def test_replace__assign__value_returned(_globals):
+    ldict = {"var": "foo foo bar"}
+    exec(translate_string("new = var =~ s/foo/baz/g"), _globals, ldict)
+    assert ldict["var"] == "baz baz bar"
+    assert ldict["new"] == "baz baz bar"
+
+
+def test_replace__chained_assign__value_returned(_globals):
+    ldict = {"var": "foo bar"}
+    exec(translate_string("a = b = var =~ s/foo/baz/"), _globals, ldict)
+    assert ldict["a"] == ldict["b"] == ldict["var"] == "baz bar"
+
+
+def test_replace__count__count_returned(_globals):
+    ldict = {"var": "foo foo bar"}
+    exec(translate_string("count = var =~ s/foo/baz/gc"), _globals, ldict)
+    assert ldict["var"] == "baz baz bar"
+    assert ldict["count"] == 2
+
+
+def test_split__fields(_globals):
+    ldict = {"var": "a, b,c"}
+    exec(translate_string(r"fields = list(split(/,\s*/, var))"), _globals, ldict)
+    assert ldict["fields"] == ["a", "b", "c"]
+
+
+def test_split__list_assign__padded(_globals):
+    ldict = {"line": "key=value=more"}
+    exec(translate_string("(key, value) = split(/=/, line, 2)"), _globals, ldict)
+    assert (ldict["key"], ldict["value"]) == ("key", "value=more")
+
+    ldict = {"line": "key"}
+    exec(translate_string("(key, value) = split(/,/, line)"), _globals, ldict)
+    assert (ldict["key"], ldict["value"]) == ("key", None)
+
+
+def test_replace__backref__value_replaced(_globals):
+    ldict = {"var": "foo one bar"}
+    exec(translate_string("var =~ s/^foo (.+?) bar/$1 foo/"), _globals, ldict)
+    assert ldict["var"] == "one foo"
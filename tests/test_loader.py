@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+
+from perl.loader import TranslationIndex, format_stats, is_stdlib
+
+
+def test_index__unchanged__not_translated(tmp_path, monkeypatch):
+    path = tmp_path / "module.py"
+    path.write_text("var =~ /foo/\n")
+    index = TranslationIndex()
+    translated = index.get(str(path))
+    assert translated == "__perl__re_match(re.search(r'foo', var))\n"
+    assert not index.is_stale(str(path))
+
+    # Touched without changing content
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    assert index.stale() == [str(path)]
+    monkeypatch.setattr("perl.translator.translate", None)
+    assert index.get(str(path)) is translated
+    assert index.stale() == []
+
+
+def test_index__changed__translated(tmp_path):
+    path = tmp_path / "module.py"
+    path.write_text("var =~ /foo/\n")
+    index = TranslationIndex()
+    index.get(str(path))
+
+    path.write_text("var =~ /foobar/\n")
+    assert index.is_stale(str(path))
+    assert index.get(str(path)) == "__perl__re_match(re.search(r'foobar', var))\n"
+
+
+def test_is_stdlib():
+    assert is_stdlib(os.path.dirname(os.__file__))
+    assert is_stdlib(os.path.dirname(json.__file__))
+    assert not is_stdlib(os.path.dirname(__file__))
+    assert not is_stdlib(os.path.join(os.path.dirname(os.__file__), "site-packages"))
+
+
+def test_index__profile__stats_collected(tmp_path):
+    path = tmp_path / "module.py"
+    path.write_text("var =~ /foo/\nvar =~ s/foo/bar/\n")
+    index = TranslationIndex(profile=True)
+    index.get(str(path), "module")
+    index.get(str(path), "module")
+
+    # Only translations are recorded
+    (stats,) = index.get_stats()
+    assert stats.name == "module"
+    assert stats.sites == 2
+    assert stats.tokens > 0
+    assert stats.bytes_in == 31
+    assert stats.bytes_out == len(index.get(str(path)))
+    assert stats.time > 0
+    assert "module" in format_stats([stats])
+
+
+def test_index__not_profiled__no_stats(tmp_path):
+    path = tmp_path / "module.py"
+    path.write_text("var =~ /foo/\n")
+    index = TranslationIndex()
+    index.get(str(path))
+    assert index.get_stats() == []
+
+
+def test_main__profile_imports(tmp_path):
+    (tmp_path / "module.py").write_text('value = "foo"\nvalue =~ s/foo/bar/\n')
+    (tmp_path / "script.py").write_text("import module\nprint(module.value)\n")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-m", "perl", "--profile-imports", "script.py"],
+        cwd=str(tmp_path),
+        env=dict(os.environ, PYTHONPATH=root),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+    assert result.stdout == "bar\n"
+
+    header, *rows, total = result.stderr.splitlines()
+    assert header.split()[-1] == "module"
+    assert sorted(row.split()[-1] for row in rows) == ["__main__", "module"]
+    assert total.endswith("total for 2 modules")
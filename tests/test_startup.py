@@ -0,0 +1,79 @@
+"""
+Guard the cost of ``import perl``
+
+Runs ``import perl`` in a clean interpreter with ``-X importtime`` and checks that
+modules which are only needed once code is translated have not been imported
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFERRED = [
+    "perl.compiler",
+    "perl.console",
+    "perl.translator",
+    "perl.utils",
+    "code",
+    "hashlib",
+    "importlib.abc",
+    "importlib.resources",
+    "tokenize",
+]
+
+
+def import_times(code):
+    """
+    Run the code with ``-X importtime`` and return a dict of cumulative import times
+    in microseconds, keyed on module name
+    """
+    result = subprocess.run(
+        [sys.executable, "-S", "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_startup__import__deferred():
+    times = import_times("import perl")
+    assert "perl" in times
+    imported = [name for name in DEFERRED if name in times]
+    assert imported == [], f"import perl took {times['perl']}us"
+
+
+def test_startup__import__runtime_not_installed():
+    result = subprocess.run(
+        [sys.executable, "-S", "-c", "import builtins, perl; print(builtins.re)"],
+        cwd=ROOT,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    assert "AttributeError" in result.stderr
+
+
+def test_startup__import_translated__runtime_installed(tmp_path):
+    (tmp_path / "translated.py").write_text(
+        "var = 'one foo two'\nresult = bool(var =~ /foo/)\n"
+    )
+    code = (
+        "import sys, perl; sys.path.insert(0, sys.argv[1]); import translated; "
+        "print(translated.result)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-S", "-c", code, str(tmp_path)],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+    assert result.stdout.strip() == "True"
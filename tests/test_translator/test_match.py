@@ -21,6 +21,19 @@ def test_translate__escaped():
     )
 
 
+def test_translate__interpolated():
+    assert translate_string(r"var =~ /^$prefix\d{2}$/i") == (
+        "__perl__re_match(__perl__re_compile(rf'^{prefix}\\d{{2}}$', re.I).search(var))"
+    )
+
+
+def test_translate__interpolated_once():
+    assert (
+        translate_string("var =~ /$prefix/o")
+        == "__perl__re_match(__perl__re_once(rf'{prefix}').search(var))"
+    )
+
+
 def test_translate__if_match_with_brackets():
     assert (
         translate_string(
@@ -62,6 +75,19 @@ def test_translate__match_assign():
     )
 
 
+def test_translate__list_assign():
+    assert translate_string(r"(a, b) = var =~ /(\d+)-(\d+)/") == (
+        r"(a, b) = __perl__re_groups(re.search(r'(\d+)-(\d+)', var), 2)"
+    )
+
+
+def test_translate__list_assign_single():
+    assert (
+        translate_string("(a) = var =~ /(foo)/")
+        == "(a,) = __perl__re_groups(re.search(r'(foo)', var), 1)"
+    )
+
+
 def test_translate__replace():
     assert (
         translate_string("var =~ s/foo/bar/")
@@ -72,14 +98,15 @@ def test_translate__replace():
 def test_translate__replace_with_backref():
     assert (
         translate_string("var =~ s/^foo (.+?) bar/foo $1 bar/")
-        == "var = __perl__reset_vars() or re.sub(r'^foo (.+?)', r'foo \\g<1> bar')"
+        == "var = __perl__reset_vars() or "
+        "re.sub(r'^foo (.+?) bar', r'foo \\g<1> bar', var, count=1)"
     )
 
 
 def test_translate__replace_with_named_backref():
     assert translate_string("var =~ s/^foo (?P<named>.+?) bar/foo $named bar/") == (
         "var = __perl__reset_vars() or "
-        "re.sub(r'^foo (?P<named>.+?) bar', r'foo \\g<named> bar')"
+        "re.sub(r'^foo (?P<named>.+?) bar', r'foo \\g<named> bar', var, count=1)"
     )
 
 
@@ -88,3 +115,14 @@ def test_translate__replace_all():
         translate_string("var =~ s/foo/bar/g")
         == "var = __perl__reset_vars() or re.sub(r'foo', r'bar', var)"
     )
+
+
+def test_translate__match_conditional_expression():
+    assert (
+        translate_string('y = "yes" if var =~ /foo/ else "no"')
+        == "y = \"yes\" if __perl__re_match(re.search(r'foo', var)) else \"no\""
+    )
+
+
+def test_translate__match_replace_modifier():
+    assert translate_string("var =~ /foo/e") == "var =~ /foo/e"
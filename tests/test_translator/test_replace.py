@@ -0,0 +1,76 @@
+import pytest
+
+from perl.translator import ParseError, translate_string
+
+
+def test_translate__replace():
+    assert (
+        translate_string("var =~ s/foo/bar/")
+        == "var = __perl__reset_vars() or re.sub(r'foo', r'bar', var, count=1)"
+    )
+
+
+def test_translate__replace_with_backref():
+    assert (
+        translate_string("var =~ s/^foo (.+?) bar/foo $1 bar/")
+        == "var = __perl__reset_vars() or "
+        "re.sub(r'^foo (.+?) bar', r'foo \\g<1> bar', var, count=1)"
+    )
+
+
+def test_translate__replace_with_named_backref():
+    assert translate_string("var =~ s/^foo (?P<named>.+?) bar/foo $named bar/") == (
+        "var = __perl__reset_vars() or "
+        "re.sub(r'^foo (?P<named>.+?) bar', r'foo \\g<named> bar', var, count=1)"
+    )
+
+
+def test_translate__replace_all():
+    assert (
+        translate_string("var =~ s/foo/bar/g")
+        == "var = __perl__reset_vars() or re.sub(r'foo', r'bar', var)"
+    )
+
+
+def test_translate__replace_eval():
+    assert translate_string("var =~ s/(?P<word>\\w+)/$word.upper()/ge") == (
+        "var = __perl__reset_vars() or "
+        "re.sub(r'(?P<word>\\w+)', lambda __perl__m: __perl__str(__perl__m['word'].upper()), var)"
+    )
+
+
+def test_translate__replace_assign():
+    assert (
+        translate_string("new = var =~ s/foo/bar/g")
+        == "new = var = __perl__reset_vars() or re.sub(r'foo', r'bar', var)"
+    )
+
+
+def test_translate__replace_count():
+    assert (
+        translate_string("count = var =~ s/foo/bar/gc")
+        == "var, count = __perl__reset_vars() or re.subn(r'foo', r'bar', var)"
+    )
+
+
+def test_translate__replace_count_indented():
+    assert translate_string("if x:\n    count = var =~ s/foo/bar/gc\n") == (
+        "if x:\n    var, count = __perl__reset_vars() or re.subn(r'foo', r'bar', var)\n"
+    )
+
+
+def test_translate__replace_assign_attribute():
+    assert (
+        translate_string("self.new = var =~ s/foo/bar/g")
+        == "self.new = var = __perl__reset_vars() or re.sub(r'foo', r'bar', var)"
+    )
+
+
+def test_translate__replace_count_attribute():
+    with pytest.raises(ParseError):
+        translate_string("self.count = var =~ s/foo/bar/gc")
+
+
+def test_translate__replace_count_without_assign():
+    with pytest.raises(ParseError):
+        translate_string("var =~ s/foo/bar/c")
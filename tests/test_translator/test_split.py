@@ -0,0 +1,48 @@
+from perl.translator import translate_string
+
+
+def test_translate__split():
+    assert (
+        translate_string("split(/,/, var)")
+        == "__perl__split(__perl__re_compile(r','), var)"
+    )
+
+
+def test_translate__split_limit_flags():
+    assert (
+        translate_string("fields = split(/x/i, var, 2)")
+        == "fields = __perl__split(__perl__re_compile(r'x', re.I), var, 2)"
+    )
+
+
+def test_translate__split_not_pattern():
+    assert translate_string("fields = split(var)") == "fields = split(var)"
+
+
+def test_translate__split_equals():
+    assert translate_string("(key, value) = split(/=/, line, 2)") == (
+        "(key, value) = __perl__split_targets(2, __perl__re_compile(r'='), line, 2)"
+    )
+
+
+def test_translate__split_method():
+    assert translate_string("line.split(/,/)") == "line.split(/,/)"
+
+
+def test_translate__split_whitespace():
+    assert (
+        translate_string("split(/ /, var)")
+        == "__perl__split(__perl__re_compile(r' '), var)"
+    )
+
+
+def test_translate__split_assign_attribute():
+    assert translate_string("self.parts = split(/,/, var)") == (
+        "self.parts = __perl__split(__perl__re_compile(r','), var)"
+    )
+
+
+def test_translate__split_assign_subscript():
+    assert translate_string("x[0].parts = split(/,/, var)") == (
+        "x[0].parts = __perl__split(__perl__re_compile(r','), var)"
+    )
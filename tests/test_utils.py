@@ -1,7 +1,7 @@
 import builtins
 import re
 
-from perl.utils import re_match, reset_vars
+from perl.utils import RegexCache, re_groups, re_match, reset_vars, split, split_targets
 
 
 def test_utils__reset_vars():
@@ -53,3 +53,63 @@ def test_utils__re_match_global():
     assert hasattr(returned_matches_iter, "__iter__")
     returned_matches = list(returned_matches_iter)
     assert [m.groups() for m in matches] == [m.groups() for m in returned_matches]
+
+
+def test_utils__regex_cache():
+    cache = RegexCache(maxsize=2)
+    compiled = cache.compile("foo")
+    assert cache.compile("foo") is compiled
+    cache.compile("bar")
+    cache.compile("baz")
+    assert cache.info() == (1, 3, 2, 2)
+
+    # Least recently used was evicted
+    cache.compile("foo")
+    assert cache.misses == 4
+
+    cache.maxsize = 1
+    assert cache.info().currsize == 1
+
+
+def test_utils__re_groups():
+    assert re_groups(re.search(r"(\d+)-(\d+)", "12-34"), 2) == ("12", "34")
+    assert re_groups(re.search(r"(\d+)", "12"), 2) == ("12", None)
+    assert re_groups(None, 2) == (None, None)
+    assert re_groups(re.finditer(r"(\d)", "1 2 3"), 2) == ("1", "2")
+    assert re_groups(re.finditer(r"\d", "1 2 3"), 2) == ("1", "2")
+    assert "__perl__var__1" not in builtins.__dict__
+
+
+def test_utils__split():
+    fields = split(re.compile(","), "a,b,,c,,")
+    assert not isinstance(fields, list)
+    assert list(fields) == ["a", "b", "", "c"]
+
+
+def test_utils__split_limit():
+    assert list(split(re.compile(","), "a,b,,c,,", -1)) == ["a", "b", "", "c", "", ""]
+    assert list(split(re.compile(","), "a,b,c,d", 2)) == ["a", "b,c,d"]
+
+
+def test_utils__split_captures():
+    assert list(split(re.compile(r"(-)|(\+)"), "1-2+3")) == [
+        "1",
+        "-",
+        None,
+        "2",
+        None,
+        "+",
+        "3",
+    ]
+
+
+def test_utils__split_empty_matches():
+    assert list(split(re.compile(""), "abc")) == ["a", "b", "c"]
+    assert list(split(re.compile("x*"), "axb")) == ["a", "b"]
+    assert list(split(re.compile(","), "")) == []
+
+
+def test_utils__split_targets():
+    assert split_targets(2, re.compile(","), "a,b,c") == ("a", "b")
+    assert split_targets(2, re.compile(","), "a") == ("a", None)
+    assert split_targets(2, re.compile(","), "a,b,c", 2) == ("a", "b,c")